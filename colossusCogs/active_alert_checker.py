@@ -0,0 +1,94 @@
+"""
+Active alert checker cog for ColossusBot.
+
+Posts a notice to the guild's log channel when a channel comes back to
+life after a long stretch of silence.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Dict, Optional
+
+from colossusCogs.channel_archiver import snowflake_timestamp
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+# guild_id -> log channel id (None means "checked, not configured"), shared
+# so config commands can invalidate entries without a cog reference.
+LOG_CHANNEL_CACHE: Dict[int, Optional[int]] = {}
+_CACHE_LOCK = asyncio.Lock()
+
+# Fixed palette picked once at import; indexing by message id beats a
+# Mersenne-Twister draw on the per-message path.
+PALETTE = tuple(random.randint(0, 0xFFFFFF) for _ in range(256))
+
+
+class ActiveAlertChecker(commands.Cog):
+    """Announces channels that become active again after a quiet period."""
+
+    ALERT_GAP_SECONDS = 3600
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        self._prev_message_ids: Dict[int, int] = {}
+
+    async def _get_log_channel_id(self, guild_id: int) -> Optional[int]:
+        """Return the guild's log channel id, caching negative results too."""
+        if guild_id in LOG_CHANNEL_CACHE:
+            return LOG_CHANNEL_CACHE[guild_id]
+        async with _CACHE_LOCK:
+            if guild_id in LOG_CHANNEL_CACHE:
+                return LOG_CHANNEL_CACHE[guild_id]
+            channel_id = await self.db_handler.get_log_channel_id(guild_id)
+            LOG_CHANNEL_CACHE[guild_id] = channel_id
+            return channel_id
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.author.bot or message.guild is None:
+            return
+        try:
+            log_channel_id = await self._get_log_channel_id(message.guild.id)
+            if log_channel_id is None:
+                return
+            prev_id = self._prev_message_ids.get(message.channel.id)
+            self._prev_message_ids[message.channel.id] = message.id
+            if prev_id is None:
+                return
+            time_diff = message.created_at.timestamp() - snowflake_timestamp(prev_id)
+            if time_diff < self.ALERT_GAP_SECONDS:
+                return
+            log_channel = message.guild.get_channel(log_channel_id)
+            if log_channel is None:
+                return
+            embed = discord.Embed(
+                title="Channel active again",
+                description=(
+                    f"{message.channel.mention} saw its first message in "
+                    f"{int(time_diff // 60)} minutes."
+                ),
+                color=PALETTE[message.id & 0xFF],
+            )
+            await log_channel.send(embed=embed)
+        except Exception:
+            logger.exception("ActiveAlertChecker.on_message failure")
+
+    @commands.command(name="setlogchannel")
+    @commands.has_permissions(manage_guild=True)
+    async def set_log_channel(self, ctx: commands.Context, channel: discord.TextChannel) -> None:
+        """Configure the log channel for this guild."""
+        await self.db_handler.set_log_channel_id(ctx.guild.id, channel.id)
+        LOG_CHANNEL_CACHE[ctx.guild.id] = channel.id
+        await ctx.send(f"Log channel set to {channel.mention}.")
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(ActiveAlertChecker(client, client.db_handler))
+    logger.info("ActiveAlertChecker cog loaded successfully.")
@@ -0,0 +1,147 @@
+"""
+Admin commands cog for ColossusBot.
+
+Warning bookkeeping (backed by its own SQLite table) plus the usual
+moderation helpers: warn, list warnings, mute.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import aiosqlite
+import discord
+from discord.ext import commands
+
+logger = logging.getLogger("ColossusBot")
+
+
+class AdminCommands(commands.Cog):
+    """Moderation commands: warnings and mutes."""
+
+    _INSERT_WARN = "INSERT INTO warnings (user_id, guild_id, reason) VALUES (?, ?, ?)"
+    _SELECT_WARNINGS = "SELECT reason, timestamp FROM warnings WHERE user_id = ? AND guild_id = ?"
+    _FLUSH_INTERVAL = 5.0
+
+    def __init__(self, client: commands.Bot) -> None:
+        self.client = client
+        self.db_path = os.getenv("COLOSSUS_DB_PATH", "colossusbot.db")
+        self.db: Optional[aiosqlite.Connection] = None
+        self._warn_buffer: List[Tuple[int, int, str]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._mute_roles: Dict[int, int] = {}
+
+    async def cog_load(self) -> None:
+        """Open the long-lived database connection and ensure the schema."""
+        self.db = await aiosqlite.connect(self.db_path)
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.create_warning_table()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def cog_unload(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self.db is not None:
+            await self._flush_warnings()
+            await self.db.close()
+
+    async def _flush_warnings(self) -> None:
+        """Write any buffered warnings in one transaction."""
+        if not self._warn_buffer:
+            return
+        buffered, self._warn_buffer = self._warn_buffer, []
+        await self.db.executemany(self._INSERT_WARN, buffered)
+        await self.db.commit()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._FLUSH_INTERVAL)
+            try:
+                await self._flush_warnings()
+            except Exception:
+                logger.exception("AdminCommands warning flush failed")
+
+    async def create_warning_table(self) -> None:
+        """Create the warnings table if it does not exist yet."""
+        await self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS warnings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                guild_id INTEGER NOT NULL,
+                reason TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_warnings_user_guild ON warnings(user_id, guild_id)"
+        )
+        await self.db.commit()
+
+    async def log_warning(self, user_id: int, guild_id: int, reason: str) -> None:
+        """Queue one warning row for the next batched flush."""
+        self._warn_buffer.append((user_id, guild_id, reason))
+
+    async def fetch_warnings(self, user_id: int, guild_id: int) -> List[Tuple]:
+        """Return (reason, timestamp) rows for a member in a guild."""
+        await self._flush_warnings()
+        async with self.db.execute(self._SELECT_WARNINGS, (user_id, guild_id)) as cursor:
+            return await cursor.fetchall()
+
+    async def mute_user_logic(self, ctx: commands.Context, member: discord.Member, reason: str) -> None:
+        """Ensure a Muted role exists, deny it speaking rights, and apply it."""
+        mute_role = None
+        role_id = self._mute_roles.get(ctx.guild.id)
+        if role_id is not None:
+            mute_role = ctx.guild.get_role(role_id)
+        if mute_role is None:
+            mute_role = discord.utils.get(ctx.guild.roles, name="Muted")
+            if mute_role is None:
+                mute_role = await ctx.guild.create_role(name="Muted", reason="ColossusBot mute role")
+                await asyncio.gather(
+                    *(
+                        channel.set_permissions(mute_role, speak=False, send_messages=False)
+                        for channel in ctx.guild.channels
+                    ),
+                    return_exceptions=True,
+                )
+            self._mute_roles[ctx.guild.id] = mute_role.id
+        await member.add_roles(mute_role, reason=reason)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if self._mute_roles.get(role.guild.id) == role.id:
+            self._mute_roles.pop(role.guild.id, None)
+
+    @commands.command(name="warn")
+    @commands.has_permissions(kick_members=True)
+    async def warn(self, ctx: commands.Context, member: discord.Member, *, reason: str = "No reason given") -> None:
+        """Warn a member and record it."""
+        await self.log_warning(member.id, ctx.guild.id, reason)
+        await ctx.send(f"{member.mention} has been warned: {reason}")
+
+    @commands.command(name="warnings")
+    @commands.has_permissions(kick_members=True)
+    async def warnings(self, ctx: commands.Context, member: discord.Member) -> None:
+        """List a member's warnings."""
+        rows = await self.fetch_warnings(member.id, ctx.guild.id)
+        if not rows:
+            await ctx.send(f"{member.display_name} has no warnings.")
+            return
+        lines = [f"{i + 1}. {reason} ({timestamp})" for i, (reason, timestamp) in enumerate(rows)]
+        await ctx.send(f"Warnings for {member.display_name}:\n" + "\n".join(lines))
+
+    @commands.command(name="mute")
+    @commands.has_permissions(manage_roles=True)
+    async def mute(self, ctx: commands.Context, member: discord.Member, *, reason: str = "No reason given") -> None:
+        """Mute a member via the Muted role."""
+        await self.mute_user_logic(ctx, member, reason)
+        await ctx.send(f"{member.mention} has been muted: {reason}")
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(AdminCommands(client))
+    logger.info("AdminCommands cog loaded successfully.")
@@ -0,0 +1,122 @@
+"""
+AI chatbot cog for ColossusBot.
+
+Relays mentions to OpenAI chat completions and lets the model request
+moderation actions via an inline [ACTION:@user:reason] tag.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from collections import deque
+from typing import Deque, Dict
+
+import discord
+from cachetools import TTLCache
+from discord.ext import commands
+from openai import AsyncOpenAI
+
+logger = logging.getLogger("ColossusBot")
+
+_MOD_ACTION_RE = re.compile(
+    r"\[(KICK|BAN|MUTE|WARN):(?:<@!?(\d+)>|@(\w+)):(.+?)\]", re.IGNORECASE
+)
+
+SYSTEM_PROMPT = (
+    "You are ColossusBot, a helpful Discord moderator assistant. "
+    "If a moderation action is warranted, include a tag of the form "
+    "[KICK|BAN|MUTE|WARN:@username:reason] in your reply."
+)
+
+
+class AIChatbot(commands.Cog):
+    """Chats with users via OpenAI and applies AI-suggested moderation."""
+
+    def __init__(self, client: commands.Bot) -> None:
+        self.client = client
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Bounded per-user context: at most 10 turns each, and inactive
+        # users fall out of the outer cache after an hour.
+        self.conversation_history: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+        self._mute_roles: Dict[int, int] = {}
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.author.bot or message.guild is None:
+            return
+        if self.client.user not in message.mentions:
+            return
+        await self.chat(message)
+
+    async def chat(self, message: discord.Message) -> None:
+        """Send the conversation to OpenAI and relay the reply."""
+        history: Deque[Dict[str, str]] = self.conversation_history.get(message.author.id)
+        if history is None:
+            history = deque(maxlen=10)
+        self.conversation_history[message.author.id] = history
+        history.append({"role": "user", "content": message.clean_content})
+        conversation = [{"role": "system", "content": SYSTEM_PROMPT}, *history]
+        response = await self.openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=conversation,
+        )
+        ai_response = response.choices[0].message.content
+        history.append({"role": "assistant", "content": ai_response})
+
+        match = _MOD_ACTION_RE.search(ai_response)
+        if match:
+            ai_response = ai_response.replace(match.group(0), "").strip()
+            target = match.group(2) or match.group(3)
+            await self.perform_moderation_action(
+                message.guild, match.group(1).upper(), target, match.group(4)
+            )
+        await message.channel.send(ai_response)
+
+    async def perform_moderation_action(
+        self, guild: discord.Guild, action: str, target_username: str, reason: str
+    ) -> None:
+        """Apply an AI-requested moderation action to the named member."""
+        if target_username.isdigit():
+            member = guild.get_member(int(target_username))
+        else:
+            member = guild.get_member_named(target_username)
+        if member is None:
+            logger.warning("AIChatbot could not resolve member %r for %s", target_username, action)
+            return
+        if action == "KICK":
+            await member.kick(reason=reason)
+        elif action == "BAN":
+            await member.ban(reason=reason)
+        elif action == "WARN":
+            admin = self.client.get_cog("AdminCommands")
+            if admin is not None:
+                await admin.log_warning(member.id, guild.id, reason)
+        elif action == "MUTE":
+            mute_role = None
+            role_id = self._mute_roles.get(guild.id)
+            if role_id is not None:
+                mute_role = guild.get_role(role_id)
+            if mute_role is None:
+                mute_role = discord.utils.get(guild.roles, name="Muted")
+                if mute_role is None:
+                    mute_role = await guild.create_role(name="Muted", reason="ColossusBot mute role")
+                    await asyncio.gather(
+                        *(
+                            channel.set_permissions(mute_role, speak=False, send_messages=False)
+                            for channel in guild.channels
+                        ),
+                        return_exceptions=True,
+                    )
+                self._mute_roles[guild.id] = mute_role.id
+            await member.add_roles(mute_role, reason=reason)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if self._mute_roles.get(role.guild.id) == role.id:
+            self._mute_roles.pop(role.guild.id, None)
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(AIChatbot(client))
+    logger.info("AIChatbot cog loaded successfully.")
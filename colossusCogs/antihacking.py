@@ -0,0 +1,240 @@
+"""
+Anti-hacking cog for ColossusBot.
+
+Watches audit-log-worthy guild events (channel/role churn, member
+updates, command bursts) and raises an alert when one account performs
+too many sensitive actions inside a short window — the usual signature
+of a compromised moderator account.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+ALERT_TEMPLATE = (
+    "🚨 **Security Alert:** User **{name}** (ID: {uid}) has performed too "
+    "many sensitive actions in {window:.0f} seconds in **{guild}**. "
+    "Possible account compromise detected."
+)
+
+
+def safe_listener(fn):
+    """Log-and-swallow wrapper so one failing event can't kill a listener.
+
+    Keeps the try/except in a single place instead of repeating the same
+    boilerplate block in every listener body.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await fn(self, *args, **kwargs)
+        except Exception:
+            logger.exception("AntiHacking listener %s failed", fn.__name__)
+
+    return wrapper
+
+
+class AntiHacking(commands.Cog):
+    """Flags accounts performing sensitive actions at suspicious rates."""
+
+    ACTION_THRESHOLD = 5
+    TIME_WINDOW = 30.0
+    # Tokens refill at threshold/window per second up to the threshold cap.
+    REFILL_RATE = ACTION_THRESHOLD / TIME_WINDOW
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        # Keyed by (guild_id << 64) | user_id packed into one int: no
+        # tuple allocation per event and a single int hash per probe.
+        # Values are [tokens, last_refill]: constant memory per user, no
+        # timestamp history to rebuild on every event. The factory seeds
+        # a full bucket so first sight of a user is a single dict probe.
+        self.user_actions: Dict[int, List[float]] = defaultdict(
+            lambda: [float(self.ACTION_THRESHOLD), time.monotonic()]
+        )
+        self._config_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._total_actions = 0
+        # Keyed by channel id, not guild id: the id comes from the
+        # TTL'd config lookup each time, so reconfiguring the staff
+        # channel re-resolves naturally instead of pinning the old
+        # channel until restart.
+        self._chan_cache: Dict[int, discord.abc.Messageable] = {}
+        self._background_task: Optional[asyncio.Task] = None
+        # Only the latest flagged name is kept; the worker builds the one
+        # discord.Game it actually applies instead of one per alert.
+        self._pending_presence_name: Optional[str] = None
+        self._presence_task: Optional[asyncio.Task] = None
+
+    async def cog_load(self) -> None:
+        self._background_task = asyncio.create_task(self.background_task())
+        self._presence_task = asyncio.create_task(self._presence_worker())
+
+    async def cog_unload(self) -> None:
+        if self._background_task is not None:
+            self._background_task.cancel()
+        if self._presence_task is not None:
+            self._presence_task.cancel()
+
+    async def _presence_worker(self) -> None:
+        """Apply at most one presence update per 15s; alerts just set the latest."""
+        while True:
+            await asyncio.sleep(15)
+            if self._pending_presence_name is None:
+                continue
+            pending, self._pending_presence_name = self._pending_presence_name, None
+            try:
+                await self.client.change_presence(
+                    activity=discord.Game(name=f"Watching {pending}")
+                )
+            except Exception:
+                logger.exception("AntiHacking presence update failed")
+
+    async def get_config_cached(self, guild_id: int) -> Dict[str, Any]:
+        """Return the guild config, refreshing from the DB at most once per minute."""
+        now = time.monotonic()
+        hit = self._config_cache.get(guild_id)
+        if hit is not None and now - hit[0] < 60.0:
+            return hit[1]
+        config = await self.db_handler.get_config(guild_id)
+        self._config_cache[guild_id] = (now, config)
+        return config
+
+    async def track_action(self, user_id: int, user_name: str, guild: discord.Guild) -> None:
+        """Record one sensitive action and alert when the window fills up."""
+        key = (guild.id << 64) | user_id
+        current_time = time.monotonic()
+        bucket = self.user_actions[key]
+        elapsed = current_time - bucket[1]
+        tokens = min(float(self.ACTION_THRESHOLD), bucket[0] + elapsed * self.REFILL_RATE)
+        tokens -= 1.0
+        bucket[0] = tokens
+        bucket[1] = current_time
+        self._total_actions += 1
+        if tokens < 0:
+            await self.handle_suspicious_activity(user_id, user_name, guild)
+
+    async def handle_suspicious_activity(
+        self, user_id: int, user_name: str, guild: discord.Guild
+    ) -> None:
+        """Alert staff and record the incident."""
+        self.user_actions.pop((guild.id << 64) | user_id, None)
+        alert_message = ALERT_TEMPLATE.format_map(
+            {
+                "name": user_name,
+                "uid": user_id,
+                "window": self.TIME_WINDOW,
+                "guild": guild.name,
+            }
+        )
+        config = await self.get_config_cached(guild.id)
+        channel_id = config.get("staff_channel_id") or config.get("log_channel_id")
+        channel = None
+        if channel_id:
+            channel = self._chan_cache.get(channel_id)
+            if channel is None:
+                channel = guild.get_channel(channel_id)
+                if channel is not None:
+                    self._chan_cache[channel_id] = channel
+        if channel is not None:
+            await channel.send(alert_message)
+        self._pending_presence_name = user_name
+        self.db_handler.queue_insert(
+            "security_incidents",
+            {
+                "guild_id": guild.id,
+                "user_id": user_id,
+                "user_name": user_name,
+                "details": "action threshold exceeded",
+            },
+        )
+
+    async def background_task(self) -> None:
+        """Periodic bookkeeping: log how much activity is being tracked."""
+        while True:
+            await asyncio.sleep(60)
+            # Sweep keys that have been idle past two windows so the dict
+            # scales with concurrently active users, not every user ever seen.
+            cutoff = time.monotonic() - self.TIME_WINDOW * 2
+            stale = [
+                key
+                for key, bucket in self.user_actions.items()
+                if bucket[1] < cutoff
+            ]
+            for key in stale:
+                del self.user_actions[key]
+            logger.debug(
+                "AntiHacking has seen %d actions across %d tracked users",
+                self._total_actions,
+                len(self.user_actions),
+            )
+
+    async def _track_audit(
+        self, guild: discord.Guild, action: discord.AuditLogAction, target_id: int
+    ) -> None:
+        """Attribute a guild event to its actor via the newest audit entry."""
+        # Without view_audit_log the REST call below can only fail; skip it.
+        if not guild.me.guild_permissions.view_audit_log:
+            return
+        entry = None
+        async for candidate in guild.audit_logs(limit=1, action=action):
+            entry = candidate
+        if entry is not None and entry.target.id == target_id:
+            await self.track_action(entry.user.id, entry.user.display_name, guild)
+
+    @commands.Cog.listener()
+    @safe_listener
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        await self._track_audit(
+            channel.guild, discord.AuditLogAction.channel_create, channel.id
+        )
+
+    @commands.Cog.listener()
+    @safe_listener
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self._chan_cache.pop(channel.id, None)
+        await self._track_audit(
+            channel.guild, discord.AuditLogAction.channel_delete, channel.id
+        )
+
+    @commands.Cog.listener()
+    @safe_listener
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        await self._track_audit(role.guild, discord.AuditLogAction.role_create, role.id)
+
+    @commands.Cog.listener()
+    @safe_listener
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        await self._track_audit(role.guild, discord.AuditLogAction.role_delete, role.id)
+
+    @commands.Cog.listener()
+    @safe_listener
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.roles == after.roles:
+            return
+        await self._track_audit(
+            after.guild, discord.AuditLogAction.member_role_update, after.id
+        )
+
+    @commands.Cog.listener()
+    @safe_listener
+    async def on_command(self, ctx: commands.Context) -> None:
+        if ctx.guild is None:
+            return
+        await self.track_action(ctx.author.id, ctx.author.display_name, ctx.guild)
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(AntiHacking(client, client.db_handler))
+    logger.info("AntiHacking cog loaded successfully.")
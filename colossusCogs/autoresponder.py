@@ -0,0 +1,186 @@
+"""
+Autoresponder cog for ColossusBot.
+
+Lets staff register trigger/response pairs per guild; whenever a message
+contains a trigger, the bot replies with the configured response.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - platform without the C extension
+    ahocorasick = None
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+
+class _RegexMatcher:
+    """Trigger matcher used when pyahocorasick is unavailable.
+
+    Compiles every trigger into a single alternation so matching is one
+    C-level scan, and mimics Automaton.iter's (end_index, value) shape.
+    """
+
+    __slots__ = ("_pattern", "_indices")
+
+    def __init__(self, entry: SimpleNamespace) -> None:
+        self._indices = {trigger: i for i, trigger in enumerate(entry.triggers)}
+        self._pattern = re.compile(
+            "|".join(re.escape(trigger) for trigger in self._indices)
+        )
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def iter(self, content: str):
+        for match in self._pattern.finditer(content):
+            yield match.end() - 1, self._indices[match.group(0)]
+
+
+class Autoresponder(commands.Cog):
+    """Responds to configured trigger phrases with canned responses."""
+
+    CACHE_TTL = 60.0
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        # Structure-of-arrays per guild: parallel tuples of triggers,
+        # responses, and channel ids, indexed by the matcher payload.
+        self._cache: Dict[int, SimpleNamespace] = {}
+        self._cache_ts: Dict[int, float] = {}
+        self._cache_lock = asyncio.Lock()
+        # Values are ahocorasick.Automaton, _RegexMatcher, or None.
+        self._automatons: Dict[int, Optional[Any]] = {}
+
+    @staticmethod
+    def _make_entry(rows: List[Dict[str, Any]]) -> SimpleNamespace:
+        """Convert fetched rows into the parallel-tuple cache layout."""
+        usable = [row for row in rows if row.get("trigger")]
+        return SimpleNamespace(
+            triggers=tuple(row["trigger"] for row in usable),
+            responses=tuple(row["response"] for row in usable),
+            channel_ids=tuple(row.get("channel_id") for row in usable),
+        )
+
+    @staticmethod
+    def _build_automaton(entry: SimpleNamespace):
+        """Compile a guild's triggers into one Aho-Corasick automaton.
+
+        The automaton payload is the trigger's index into the entry's
+        parallel tuples. Returns None when the guild has no usable
+        triggers, so the hot path can bail out with a single dict
+        lookup. Falls back to one compiled regex alternation when
+        pyahocorasick is not installed.
+        """
+        if not entry.triggers:
+            return None
+        if ahocorasick is None:
+            return _RegexMatcher(entry)
+        automaton = ahocorasick.Automaton()
+        for i, trigger in enumerate(entry.triggers):
+            automaton.add_word(trigger, i)
+        automaton.make_automaton()
+        return automaton
+
+    def _cache_fresh(self, guild_id: int, now: float) -> bool:
+        return (
+            guild_id in self._cache
+            and now - self._cache_ts.get(guild_id, 0.0) < self.CACHE_TTL
+        )
+
+    async def _get_autoresponses(self, guild_id: int) -> SimpleNamespace:
+        """Return the guild's autoresponses, hitting the DB only on cache miss/expiry."""
+        now = time.monotonic()
+        if self._cache_fresh(guild_id, now):
+            return self._cache[guild_id]
+        async with self._cache_lock:
+            # Another waiter may have refreshed while we queued for the lock.
+            now = time.monotonic()
+            if self._cache_fresh(guild_id, now):
+                return self._cache[guild_id]
+            rows = await self.db_handler.fetch_autoresponses(guild_id)
+            entry = self._make_entry(rows)
+            self._cache[guild_id] = entry
+            self._cache_ts[guild_id] = now
+            self._automatons[guild_id] = self._build_automaton(entry)
+            return entry
+
+    async def _warm_cache(self) -> None:
+        """Load every guild's autoresponses with one query instead of N lazy fetches."""
+        rows = await self.db_handler.fetch_all_autoresponses()
+        grouped: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            grouped.setdefault(row["guild_id"], []).append(row)
+        now = time.monotonic()
+        async with self._cache_lock:
+            for guild_id, guild_rows in grouped.items():
+                entry = self._make_entry(guild_rows)
+                self._cache[guild_id] = entry
+                self._cache_ts[guild_id] = now
+                self._automatons[guild_id] = self._build_automaton(entry)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        await self._warm_cache()
+
+    def _invalidate(self, guild_id: int) -> None:
+        """Drop the cached autoresponses for a guild after a mutation."""
+        self._cache.pop(guild_id, None)
+        self._cache_ts.pop(guild_id, None)
+        self._automatons.pop(guild_id, None)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        await self.handle_message(message)
+
+    async def handle_message(self, message: discord.Message) -> None:
+        """Check a message against the guild's triggers and reply on a match."""
+        if message.author.bot or message.guild is None:
+            return
+        guild_id = message.guild.id
+        if not self._cache_fresh(guild_id, time.monotonic()):
+            await self._get_autoresponses(guild_id)
+        automaton = self._automatons.get(guild_id)
+        if automaton is None:
+            # Guild has no triggers: bail before copying the content string.
+            return
+        entry = self._cache[guild_id]
+        content = message.content.lower()
+        for _, i in automaton.iter(content):
+            channel_id = entry.channel_ids[i]
+            if channel_id and message.channel.id != channel_id:
+                continue
+            await message.channel.send(entry.responses[i])
+
+    @commands.command(name="addresponse")
+    @commands.has_permissions(manage_guild=True)
+    async def add_autoresponse(self, ctx: commands.Context, trigger: str, *, response: str) -> None:
+        """Register a new trigger/response pair for this guild."""
+        await self.db_handler.add_autoresponse(ctx.guild.id, trigger.lower(), response)
+        self._invalidate(ctx.guild.id)
+        await ctx.send(f"Autoresponse added for trigger `{trigger}`.")
+
+    @commands.command(name="removeresponse")
+    @commands.has_permissions(manage_guild=True)
+    async def remove_autoresponse(self, ctx: commands.Context, *, trigger: str) -> None:
+        """Remove an autoresponse by its trigger."""
+        await self.db_handler.remove_autoresponse(ctx.guild.id, trigger.lower())
+        self._invalidate(ctx.guild.id)
+        await ctx.send(f"Autoresponse removed for trigger `{trigger}`.")
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(Autoresponder(client, client.db_handler))
+    logger.info("Autoresponder cog loaded successfully.")
@@ -0,0 +1,136 @@
+"""
+Channel access manager cog for ColossusBot.
+
+Staff can toggle a member's access to a channel; every toggle is logged
+to channel_perms_log so the state can be reset or audited later.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+_INSERT_PERM_LOG = (
+    "INSERT INTO channel_perms_log (user_id, channel_id, previous_state, new_state) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
+class ChannelAccessManager(commands.Cog):
+    """Toggles and audits per-member channel access."""
+
+    _FLUSH_INTERVAL = 0.1
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        self._log_buffer: List[Tuple[int, int, str, str]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def cog_load(self) -> None:
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def cog_unload(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        await self._flush_log_buffer()
+
+    async def _flush_log_buffer(self) -> None:
+        """Write buffered toggle records with one executemany transaction."""
+        if not self._log_buffer:
+            return
+        buffered, self._log_buffer = self._log_buffer, []
+        await self.db_handler.executemany(_INSERT_PERM_LOG, buffered)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._FLUSH_INTERVAL)
+            try:
+                await self._flush_log_buffer()
+            except Exception:
+                logger.exception("channel_perms_log flush failed")
+
+    @commands.command(name="togglechannel")
+    @commands.has_permissions(manage_channels=True)
+    async def toggle_channel_access(
+        self, ctx: commands.Context, member: discord.Member, channel: discord.TextChannel
+    ) -> None:
+        """Flip a member's ability to view a channel and log the change."""
+        overwrite = channel.overwrites_for(member)
+        previous_state = str(overwrite.view_channel)
+        overwrite.view_channel = not bool(overwrite.view_channel)
+        await channel.set_permissions(member, overwrite=overwrite)
+        self._log_buffer.append(
+            (member.id, channel.id, previous_state, str(overwrite.view_channel))
+        )
+        await ctx.send(
+            f"{member.mention} can {'now' if overwrite.view_channel else 'no longer'} "
+            f"see {channel.mention}."
+        )
+
+    @commands.command(name="resetperms")
+    @commands.has_permissions(manage_channels=True)
+    async def reset_permissions(self, ctx: commands.Context) -> None:
+        """Undo every logged channel-access toggle and clear the log."""
+        await self._flush_log_buffer()
+        records = await self.db_handler.fetchall(
+            "SELECT id, user_id, channel_id FROM channel_perms_log"
+        )
+        # The log may hold several rows per (user, channel); one reset suffices.
+        rows_by_pair: Dict[Tuple[int, int], List[int]] = {}
+        for row_id, user_id, channel_id in records:
+            rows_by_pair.setdefault((user_id, channel_id), []).append(row_id)
+
+        sem = asyncio.Semaphore(5)
+        successful_ids: List[int] = []
+
+        async def reset_one(user_id: int, channel_id: int, row_ids: List[int]) -> None:
+            async with sem:
+                channel = ctx.guild.get_channel(channel_id)
+                member = ctx.guild.get_member(user_id)
+                if channel is not None and member is not None:
+                    await channel.set_permissions(member, overwrite=None)
+                # Stale rows for members/channels that no longer exist are
+                # unrecoverable either way, so clear them too.
+                successful_ids.extend(row_ids)
+
+        await asyncio.gather(
+            *(reset_one(u, c, ids) for (u, c), ids in rows_by_pair.items()),
+            return_exceptions=True,
+        )
+        if successful_ids:
+            placeholders = ",".join("?" * len(successful_ids))
+            await self.db_handler.execute(
+                f"DELETE FROM channel_perms_log WHERE id IN ({placeholders})",
+                tuple(successful_ids),
+            )
+        await ctx.send("Custom channel permissions reset.")
+
+    @commands.command(name="viewlogs")
+    @commands.has_permissions(manage_channels=True)
+    async def view_logs(self, ctx: commands.Context) -> None:
+        """Show the most recent channel-access changes."""
+        await self._flush_log_buffer()
+        logs = await self.db_handler.fetchall(
+            "SELECT user_id, channel_id, previous_state, new_state, timestamp "
+            "FROM channel_perms_log ORDER BY timestamp DESC LIMIT 10"
+        )
+        if not logs:
+            await ctx.send("No channel permission changes logged.")
+            return
+        lines = [
+            f"<@{user_id}> in <#{channel_id}>: {prev} -> {new} at {ts}"
+            for user_id, channel_id, prev, new, ts in logs
+        ]
+        await ctx.send("\n".join(lines))
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(ChannelAccessManager(client, client.db_handler))
+    logger.info("ChannelAccessManager cog loaded successfully.")
@@ -0,0 +1,145 @@
+"""
+Channel archiver cog for ColossusBot.
+
+Finds text channels with no recent activity and moves them into
+"Archive" categories, recording every move so channels can be restored.
+"""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+DISCORD_EPOCH_MS = 1420070400000
+
+_BAR_FULL = "█" * 25
+_BAR_EMPTY = "-" * 25
+
+
+def snowflake_timestamp(snowflake: int) -> float:
+    """Return the unix timestamp (seconds) encoded in a Discord snowflake."""
+    return ((snowflake >> 22) + DISCORD_EPOCH_MS) / 1000
+
+
+class ChannelArchiver(commands.Cog):
+    """Archives inactive channels into capped archive categories."""
+
+    INACTIVITY_DAYS = 30
+    MAX_CHANNELS_PER_CATEGORY = 50
+    IGNORED_CHANNELS = frozenset({"rules", "roles"})
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+
+    async def get_or_create_archive_category(
+        self, guild: discord.Guild
+    ) -> discord.CategoryChannel:
+        """Return an archive category with room left, creating one if needed."""
+        category_id = await self.db_handler.get_available_archive_category(guild.id)
+        if category_id is not None:
+            category = guild.get_channel(category_id)
+            if (
+                category is not None
+                and len(category.channels) < self.MAX_CHANNELS_PER_CATEGORY
+            ):
+                return category
+        category = await guild.create_category("Archive")
+        await self.db_handler.save_archive_category(guild.id, category.id)
+        return category
+
+    async def _inspect(
+        self,
+        guild: discord.Guild,
+        channel: discord.TextChannel,
+        cutoff: float,
+        sem: asyncio.Semaphore,
+    ) -> Optional[Tuple[discord.TextChannel, Optional[str]]]:
+        """Return (channel, last message link) when the channel is inactive."""
+        async with sem:
+            lmid = channel.last_message_id
+            if lmid is not None:
+                last_message_time = snowflake_timestamp(lmid)
+                last_message_link = (
+                    f"https://discord.com/channels/{guild.id}/{channel.id}/{lmid}"
+                )
+            else:
+                last_message_time = channel.created_at.timestamp()
+                last_message_link = None
+            if last_message_time < cutoff:
+                return channel, last_message_link
+            return None
+
+    @commands.command(name="autoarchive")
+    @commands.has_permissions(manage_channels=True)
+    async def autoarchive(self, ctx: commands.Context) -> None:
+        """Scan every text channel and archive the ones with no recent activity."""
+        guild = ctx.guild
+        cutoff = time.time() - self.INACTIVITY_DAYS * 86400
+        channels = [
+            c
+            for c in guild.text_channels
+            if c.name.lower() not in self.IGNORED_CHANNELS
+        ]
+        gathering_progress_message = await ctx.send("Scanning channels...")
+        sem = asyncio.Semaphore(20)
+        tasks = [
+            asyncio.create_task(self._inspect(guild, channel, cutoff, sem))
+            for channel in channels
+        ]
+        to_archive: List[Tuple[discord.TextChannel, Optional[str]]] = []
+        completed = 0
+        last_edit = 0.0
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            completed += 1
+            if result is not None:
+                to_archive.append(result)
+            now = time.monotonic()
+            if now - last_edit > 1.0 or completed == len(channels):
+                filled = int(25 * completed / len(channels))
+                bar = _BAR_FULL[:filled] + _BAR_EMPTY[filled:]
+                await gathering_progress_message.edit(
+                    content=f"Scanning channels... [{bar}] {completed}/{len(channels)}"
+                )
+                last_edit = now
+        if not to_archive:
+            await gathering_progress_message.edit(content="No inactive channels found.")
+            return
+        await gathering_progress_message.edit(
+            content=f"Archiving {len(to_archive)} inactive channel(s)..."
+        )
+        await self.archive_channels(guild, [c for c, _ in to_archive])
+        await gathering_progress_message.edit(
+            content=f"Archived {len(to_archive)} channel(s)."
+        )
+
+    async def archive_channels(
+        self, guild: discord.Guild, channels: List[discord.TextChannel]
+    ) -> None:
+        """Move channels into archive categories and record each move."""
+        rows: List[Tuple[int, Optional[int], int, str]] = []
+        category = await self.get_or_create_archive_category(guild)
+        count = len(category.channels)
+        for channel in channels:
+            if count >= self.MAX_CHANNELS_PER_CATEGORY:
+                category = await self.get_or_create_archive_category(guild)
+                count = len(category.channels)
+            original_category_id = channel.category_id
+            await channel.edit(category=category, sync_permissions=True)
+            rows.append((channel.id, original_category_id, category.id, "text"))
+            count += 1
+        if rows:
+            await self.db_handler.insert_archived_channels_bulk(rows)
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(ChannelArchiver(client, client.db_handler))
+    logger.info("ChannelArchiver cog loaded successfully.")
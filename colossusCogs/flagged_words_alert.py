@@ -0,0 +1,283 @@
+"""
+Flagged words alert cog for ColossusBot.
+
+Scans every message against a configurable phrase list, records hits,
+and posts an alert to the guild's staff channel where moderators choose
+a follow-up action by reaction.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - platform without the C extension
+    ahocorasick = None
+
+try:
+    # RE2 matches in guaranteed linear time, so user-supplied content can
+    # never trigger catastrophic backtracking in the pattern scan.
+    import re2 as _re_impl
+except ImportError:  # pragma: no cover - platform without the C extension
+    _re_impl = re
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+CONFIG_CACHE_TTL = 60.0
+
+VALID_REACTIONS = frozenset(("✅", "❌", "⚠️", "🔇", "👢", "🔨"))
+
+ALERT_REACTIONS = ("✅", "❌")
+ACTION_REACTIONS = ("⚠️", "🔇", "👢", "🔨")
+
+# Literal phrases plus a few patterns; both forms are scanned per message.
+FLAGGED_PHRASES = [
+    "free nitro",
+    "discord.gg/",
+    "steamcommunity.com/gift",
+    "crypto giveaway",
+    "claim your prize",
+    re.compile(r"https?://[^\s]*(?:grabify|iplogger)\.[^\s]+", re.IGNORECASE),
+    re.compile(r"@everyone.{0,40}https?://", re.IGNORECASE),
+]
+
+
+class FlaggedWordsAlert(commands.Cog):
+    """Alerts staff when a message contains a flagged word or pattern."""
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        self.flagged_phrases = FLAGGED_PHRASES
+        self._config_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._chan_cache: Dict[int, discord.abc.Messageable] = {}
+        # Alert/action messages this process posted, mapped to the
+        # flagged user, so reaction handling skips the DB on the hot
+        # path; the flagged_alert_messages table remains the fallback
+        # for alerts that predate a restart.
+        self._alert_rows: Dict[int, int] = {}
+        # Template embed built once; send_alert copies it and rewrites the
+        # field values instead of assembling five fields per message.
+        self._alert_embed_tmpl = discord.Embed(
+            title="**Flagged Word Alert!**", color=discord.Color.red()
+        )
+        self._alert_embed_tmpl.add_field(name="User", value="-", inline=True)
+        self._alert_embed_tmpl.add_field(name="Channel", value="-", inline=True)
+        self._alert_embed_tmpl.add_field(name="Phrase", value="-", inline=True)
+        self._alert_embed_tmpl.add_field(name="Message", value="-", inline=False)
+        self._alert_embed_tmpl.add_field(name="Jump", value="-", inline=False)
+        self._emoji_handlers = {
+            "✅": self._handle_accept,
+            "❌": self._handle_reject,
+            "⚠️": self._handle_warn,
+            "🔇": self._handle_mute,
+            "👢": self._handle_kick,
+            "🔨": self._handle_ban,
+        }
+
+        # Partition the phrase list once: literal strings go into an
+        # Aho-Corasick automaton (or one regex alternation when the C
+        # extension is missing); compiled patterns union into one regex.
+        literals = [p for p in self.flagged_phrases if isinstance(p, str)]
+        patterns = [p for p in self.flagged_phrases if not isinstance(p, str)]
+        self._ac = None
+        self._literal_re = None
+        if literals:
+            if ahocorasick is not None:
+                self._ac = ahocorasick.Automaton()
+                for phrase in literals:
+                    self._ac.add_word(phrase.lower(), phrase)
+                self._ac.make_automaton()
+            else:
+                self._literal_re = _re_impl.compile(
+                    "|".join(re.escape(p) for p in literals)
+                )
+        self._combined_re = (
+            _re_impl.compile(
+                "|".join(f"(?:{p.pattern})" for p in patterns), re.IGNORECASE
+            )
+            if patterns
+            else None
+        )
+
+    async def get_config_cached(self, guild_id: int) -> Dict[str, Any]:
+        """Return the guild config, refreshing from the DB at most once per TTL."""
+        now = time.monotonic()
+        hit = self._config_cache.get(guild_id)
+        if hit is not None and now - hit[0] < CONFIG_CACHE_TTL:
+            return hit[1]
+        config = await self.db_handler.get_config(guild_id)
+        self._config_cache[guild_id] = (now, config)
+        return config
+
+    def contains_flagged_words(self, content: str) -> Tuple[bool, Optional[str]]:
+        """Return (matched, phrase) for the first flagged phrase in content."""
+        if not content:
+            # Embed/attachment-only messages are common; skip the .lower()
+            # allocation and both scans outright.
+            return False, None
+        content_lower = content.lower()
+        if self._ac is not None:
+            hit = next(self._ac.iter(content_lower), None)
+            if hit is not None:
+                return True, hit[1]
+        elif self._literal_re is not None:
+            match = self._literal_re.search(content_lower)
+            if match is not None:
+                return True, match.group(0)
+        if self._combined_re is not None:
+            match = self._combined_re.search(content)
+            if match is not None:
+                return True, match.group(0)
+        return False, None
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.author.bot or message.guild is None:
+            return
+        matched, phrase = self.contains_flagged_words(message.content)
+        if not matched:
+            return
+        await self.record_message(message, phrase)
+        await self.send_alert(message, phrase)
+
+    async def record_message(self, message: discord.Message, phrase: str) -> None:
+        """Queue the flagged message for the batched background writer."""
+        self.db_handler.queue_insert(
+            "flagged_messages",
+            {
+                "guild_id": message.guild.id,
+                "user_id": message.author.id,
+                "channel_id": message.channel.id,
+                "message_id": message.id,
+                "content": message.content,
+                "phrase": phrase,
+            },
+        )
+
+    async def send_alert(self, message: discord.Message, phrase: str) -> None:
+        """Post the staff alert embed and seed the accept/reject reactions."""
+        staff_channel = self._chan_cache.get(message.guild.id)
+        if staff_channel is None:
+            config = await self.get_config_cached(message.guild.id)
+            channel_id = config.get("staff_channel_id") or config.get("log_channel_id")
+            if not channel_id:
+                return
+            staff_channel = message.guild.get_channel(channel_id)
+            if staff_channel is None:
+                return
+            self._chan_cache[message.guild.id] = staff_channel
+        embed = self._alert_embed_tmpl.copy()
+        embed.set_field_at(0, name="User", value=message.author.mention, inline=True)
+        embed.set_field_at(1, name="Channel", value=message.channel.mention, inline=True)
+        embed.set_field_at(2, name="Phrase", value=phrase, inline=True)
+        embed.set_field_at(3, name="Message", value=message.content[:1024], inline=False)
+        embed.set_field_at(4, name="Jump", value=message.jump_url, inline=False)
+        alert_message = await staff_channel.send(embed=embed)
+        self._alert_rows[alert_message.id] = message.author.id
+        await asyncio.gather(
+            *(alert_message.add_reaction(emoji) for emoji in ALERT_REACTIONS)
+        )
+        await self.db_handler.insert_flagged_alert_message(
+            alert_message.id,
+            message.guild.id,
+            message.author.id,
+            message.id,
+            message.channel.id,
+        )
+
+    @commands.Cog.listener()
+    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User) -> None:
+        if user.bot or reaction.message.guild is None:
+            return
+        handler = self._emoji_handlers.get(str(reaction.emoji))
+        if handler is None:
+            return
+        flagged_user_id = self._alert_rows.get(reaction.message.id)
+        if flagged_user_id is None:
+            # Alerts posted before a restart only exist in the DB.
+            row = await self.db_handler.fetch_flagged_alert_message(
+                reaction.message.id
+            )
+            if row is None:
+                return
+            flagged_user_id = row[2]
+            self._alert_rows[reaction.message.id] = flagged_user_id
+        guild = reaction.message.guild
+        member = guild.get_member(flagged_user_id)
+        await handler(reaction, member, guild)
+
+    async def _handle_accept(self, reaction, member, guild) -> None:
+        await self.take_action(reaction.message, member)
+
+    async def _handle_reject(self, reaction, member, guild) -> None:
+        self._alert_rows.pop(reaction.message.id, None)
+        await reaction.message.delete()
+
+    async def _handle_warn(self, reaction, member, guild) -> None:
+        if member is None:
+            return
+        admin = self.client.get_cog("AdminCommands")
+        if admin is not None:
+            await admin.log_warning(member.id, guild.id, "Flagged message")
+
+    async def _handle_mute(self, reaction, member, guild) -> None:
+        if member is None:
+            return
+        mute_role = discord.utils.get(guild.roles, name="Muted")
+        if mute_role is not None:
+            await member.add_roles(mute_role, reason="Flagged message")
+
+    async def _handle_kick(self, reaction, member, guild) -> None:
+        if member is not None:
+            await member.kick(reason="Flagged message")
+
+    async def _handle_ban(self, reaction, member, guild) -> None:
+        if member is not None:
+            await member.ban(reason="Flagged message")
+
+    async def take_action(
+        self, alert_message: discord.Message, member: Optional[discord.Member]
+    ) -> None:
+        """Post the action prompt with one reaction per available punishment."""
+        action_message = await alert_message.channel.send(
+            f"Choose an action for {member.mention if member else 'the user'}:"
+        )
+        self._alert_rows[action_message.id] = member.id if member else 0
+        await asyncio.gather(
+            *(action_message.add_reaction(emoji) for emoji in ACTION_REACTIONS)
+        )
+        await self.db_handler.insert_flagged_alert_message(
+            action_message.id,
+            alert_message.guild.id,
+            member.id if member else 0,
+        )
+
+    @commands.command(name="setstaffchannel")
+    @commands.has_permissions(manage_guild=True)
+    async def update_security_config(
+        self, ctx: commands.Context, channel: discord.TextChannel
+    ) -> None:
+        """Configure the staff alert channel for this guild."""
+        await self.db_handler.set_staff_channel_id(ctx.guild.id, channel.id)
+        self._config_cache.pop(ctx.guild.id, None)
+        self._chan_cache.pop(ctx.guild.id, None)
+        await ctx.send(f"Staff alert channel set to {channel.mention}.")
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        if self._chan_cache.get(channel.guild.id) is channel:
+            self._chan_cache.pop(channel.guild.id, None)
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(FlaggedWordsAlert(client, client.db_handler))
+    logger.info("FlaggedWordsAlert cog loaded successfully.")
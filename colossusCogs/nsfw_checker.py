@@ -0,0 +1,364 @@
+"""
+NSFW checker cog for ColossusBot.
+
+Downloads image and GIF attachments, runs them through the OCR.space
+API, and raises a staff alert when the extracted text contains a banned
+word. Staff confirm or dismiss the alert by reaction.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import re
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - platform without the C extension
+    ahocorasick = None
+
+import aiohttp
+import discord
+from discord.ext import commands
+from PIL import Image
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+OCR_API_URL = "https://api.ocr.space/parse/image"
+
+CONFIG_CACHE_TTL = 60.0
+
+# Larger files are not worth an OCR upload; tiny ones can't hold readable text.
+MAX_ATTACHMENT_BYTES = 8 * 1024 * 1024
+MIN_DIMENSION = 64
+
+ALERT_REACTIONS = ("✅", "❌")
+VALID_REACTIONS = frozenset(ALERT_REACTIONS)
+
+NSFW_WORDS = [
+    "nsfw",
+    "porn",
+    "nude",
+    "nudes",
+    "explicit",
+    "xxx",
+    "hentai",
+    "onlyfans",
+    "lewd",
+    "18+",
+]
+
+
+class NSFWChecker(commands.Cog):
+    """Flags image attachments whose embedded text contains banned words."""
+
+    # Bounded LRU over OCR results keyed by a 16-byte digest of the image
+    # bytes; repeat frames and reposted images skip the network entirely.
+    _OCR_CACHE_MAX = 2048
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        self.ocr_api_key = os.getenv("OCR_SPACE_API_KEY", "helloworld")
+        # Lowered once here; the scan lowers each OCR result once and
+        # never touches the case of a keyword again.
+        self.nsfw_word_list = [word.lower() for word in NSFW_WORDS]
+        # The word list is static, so compile it once: one linear scan per
+        # OCR result instead of a substring search per keyword. Falls back
+        # to a single regex alternation without the C extension.
+        self._ac = None
+        self._word_re = None
+        if ahocorasick is not None:
+            self._ac = ahocorasick.Automaton()
+            for word in self.nsfw_word_list:
+                self._ac.add_word(word, word)
+            self._ac.make_automaton()
+        else:
+            self._word_re = re.compile(
+                "|".join(re.escape(word) for word in self.nsfw_word_list)
+            )
+        self._ocr_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        # Whole-attachment (flagged, matched text) verdicts, so a
+        # re-upload of the same file is a single dict lookup instead of
+        # a frame-by-frame rescan; the text rides along so repeat alerts
+        # still show staff what matched.
+        self._verdict_cache: "OrderedDict[bytes, Tuple[bool, str]]" = OrderedDict()
+        self._config_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        # One session for every OCR call; created lazily so the connector
+        # binds to the running event loop.
+        self._session: Optional[aiohttp.ClientSession] = None
+        # OCR.space free tier throttles hard: cap in-flight requests and
+        # keep a minimum gap between launches so 429s stay rare.
+        self._ocr_sem = asyncio.Semaphore(4)
+        self._last_call_ts = 0.0
+        self._min_gap = 0.1
+        # PIL decode/resample is CPU-bound; run it off the event loop so
+        # image work never stalls other cogs' handlers.
+        self._img_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20, limit_per_host=10, keepalive_timeout=60
+                )
+            )
+        return self._session
+
+    async def cog_unload(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._img_pool.shutdown(wait=False)
+
+    @staticmethod
+    def _digest(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _cache_put(self, cache: OrderedDict, key: bytes, value) -> None:
+        cache[key] = value
+        if len(cache) > self._OCR_CACHE_MAX:
+            cache.popitem(last=False)
+
+    async def perform_ocr(self, image_data: bytes) -> Optional[str]:
+        """Return the text OCR.space extracts from one image, with caching.
+
+        Returns None when every attempt was throttled, so callers can
+        tell "no text in the image" apart from "never analyzed" and skip
+        caching a verdict for the latter.
+        """
+        key = self._digest(image_data)
+        cached = self._ocr_cache.get(key)
+        if cached is not None:
+            self._ocr_cache.move_to_end(key)
+            return cached
+        session = await self._get_session()
+        payload = None
+        async with self._ocr_sem:
+            for attempt in range(3):
+                # aiohttp consumes a FormData on first send, so each
+                # attempt needs a fresh one; rebuilding it is just two
+                # field appends over the same bytes.
+                data = aiohttp.FormData()
+                data.add_field("apikey", self.ocr_api_key)
+                data.add_field(
+                    "file", image_data, filename="frame.jpg", content_type="image/jpeg"
+                )
+                delay = self._min_gap - (time.monotonic() - self._last_call_ts)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._last_call_ts = time.monotonic()
+                async with session.post(OCR_API_URL, data=data) as response:
+                    if response.status in (429, 403):
+                        await asyncio.sleep(min(30, 2 ** attempt))
+                        continue
+                    payload = await response.json()
+                break
+        if payload is None:
+            return None
+        results = payload.get("ParsedResults") or []
+        text = results[0].get("ParsedText", "") if results else ""
+        self._cache_put(self._ocr_cache, key, text)
+        return text
+
+    def iter_gif_frames(self, image_data: bytes) -> Iterator[bytes]:
+        """Yield a sample of GIF frames one at a time as JPEG bytes.
+
+        Adjacent frames are near-duplicates, so OCRing at most 8 spread
+        across the animation catches the same text as OCRing all of them.
+        Yielding keeps one encoded frame in memory at a time, and a
+        first-hit break skips the remaining decode work entirely.
+        """
+        with Image.open(io.BytesIO(image_data)) as img:
+            step = max(1, img.n_frames // 8)
+            for frame_index in range(0, img.n_frames, step):
+                img.seek(frame_index)
+                frame = img.convert("RGB")
+                frame.thumbnail((1024, 1024), Image.LANCZOS)
+                buf = io.BytesIO()
+                frame.save(buf, format="JPEG", quality=80, optimize=False)
+                yield buf.getvalue()
+
+    def resize_image_if_needed(self, image_data: bytes) -> bytes:
+        """Re-encode an image as a bounded-size JPEG for the OCR upload."""
+        with Image.open(io.BytesIO(image_data)) as img:
+            frame = img.convert("RGB")
+            frame.thumbnail((1024, 1024), Image.LANCZOS)
+            buf = io.BytesIO()
+            frame.save(buf, format="JPEG", quality=80, optimize=False)
+            return buf.getvalue()
+
+    def _contains_nsfw(self, extracted_text: str) -> bool:
+        if not extracted_text:
+            return False
+        lowered = extracted_text.lower()
+        if self._ac is not None:
+            return next(self._ac.iter(lowered), None) is not None
+        return self._word_re.search(lowered) is not None
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.author.bot or message.guild is None or not message.attachments:
+            return
+        for attachment in message.attachments:
+            # Filter on attachment metadata before paying for the download.
+            content_type = attachment.content_type or ""
+            if not content_type.startswith("image/"):
+                continue
+            if attachment.size > MAX_ATTACHMENT_BYTES:
+                continue
+            if (attachment.width or 0) < MIN_DIMENSION and (
+                attachment.height or 0
+            ) < MIN_DIMENSION:
+                continue
+            image_data = await attachment.read()
+            digest = self._digest(image_data)
+            verdict = self._verdict_cache.get(digest)
+            if verdict is None:
+                # Fall back to the persistent cache so verdicts survive
+                # restarts and are shared across reposted images.
+                cached = await self.db_handler.get_ocr_cache(digest.hex())
+                if cached is not None:
+                    verdict = (cached[1], cached[0])
+                    self._cache_put(self._verdict_cache, digest, verdict)
+            else:
+                self._verdict_cache.move_to_end(digest)
+            if verdict is not None:
+                if verdict[0]:
+                    await self.handle_nsfw_content(message, verdict[1])
+                continue
+            flagged = False
+            flagged_text = ""
+            ocr_failed = False
+            loop = asyncio.get_running_loop()
+            if content_type == "image/gif":
+                # Pull frames from the generator one at a time; each next()
+                # runs the PIL decode for that frame in the image pool.
+                frame_iter = self.iter_gif_frames(image_data)
+                while True:
+                    frame = await loop.run_in_executor(
+                        self._img_pool, next, frame_iter, None
+                    )
+                    if frame is None:
+                        break
+                    extracted_text = await self.perform_ocr(frame)
+                    if extracted_text is None:
+                        ocr_failed = True
+                        break
+                    if self._contains_nsfw(extracted_text):
+                        await self.handle_nsfw_content(message, extracted_text)
+                        flagged = True
+                        flagged_text = extracted_text
+                        break
+            else:
+                image_data = await loop.run_in_executor(
+                    self._img_pool, self.resize_image_if_needed, image_data
+                )
+                extracted_text = await self.perform_ocr(image_data)
+                if extracted_text is None:
+                    ocr_failed = True
+                elif self._contains_nsfw(extracted_text):
+                    await self.handle_nsfw_content(message, extracted_text)
+                    flagged = True
+                    flagged_text = extracted_text
+            if ocr_failed:
+                # The image was never analyzed; caching False here would
+                # permanently whitelist it. Leave both caches alone so
+                # the next appearance gets a fresh scan.
+                continue
+            self._cache_put(self._verdict_cache, digest, (flagged, flagged_text))
+            await self.db_handler.put_ocr_cache(digest.hex(), flagged_text, flagged)
+
+    async def get_config_cached(self, guild_id: int) -> Dict[str, Any]:
+        """Return the guild config, refreshing from the DB at most once per TTL."""
+        now = time.monotonic()
+        hit = self._config_cache.get(guild_id)
+        if hit is not None and now - hit[0] < CONFIG_CACHE_TTL:
+            return hit[1]
+        config = await self.db_handler.get_config(guild_id)
+        self._config_cache[guild_id] = (now, config)
+        return config
+
+    async def get_staff_channel_id(self, guild_id: int) -> Optional[int]:
+        """Return the staff channel configured for a guild, if any."""
+        config = await self.get_config_cached(guild_id)
+        return config.get("staff_channel_id") or config.get("log_channel_id")
+
+    async def handle_nsfw_content(
+        self, message: discord.Message, extracted_text: str
+    ) -> None:
+        """Post the staff alert for a flagged attachment."""
+        channel_id = await self.get_staff_channel_id(message.guild.id)
+        if not channel_id:
+            return
+        staff_channel = message.guild.get_channel(channel_id)
+        if staff_channel is None:
+            return
+        embed = discord.Embed(
+            title="**NSFW Content Alert!**", color=discord.Color.orange()
+        )
+        embed.add_field(name="User", value=message.author.mention, inline=True)
+        embed.add_field(name="Channel", value=message.channel.mention, inline=True)
+        embed.add_field(name="Message Link", value=message.jump_url, inline=False)
+        embed.add_field(
+            name="Detected Text", value=extracted_text[:1024] or "-", inline=False
+        )
+        alert_message = await staff_channel.send(embed=embed)
+        await asyncio.gather(
+            *(alert_message.add_reaction(emoji) for emoji in ALERT_REACTIONS)
+        )
+        await self.db_handler.insert_nsfw_alert_message(
+            alert_message.id,
+            message.guild.id,
+            message.author.id,
+            message.id,
+            message.channel.id,
+        )
+
+    @commands.Cog.listener()
+    async def on_reaction_add(
+        self, reaction: discord.Reaction, user: discord.User
+    ) -> None:
+        if user.bot or reaction.message.guild is None:
+            return
+        if str(reaction.emoji) not in VALID_REACTIONS:
+            return
+        row = await self.db_handler.fetch_nsfw_alert_message(reaction.message.id)
+        if row is None:
+            return
+        if str(reaction.emoji) == "✅":
+            _, _, _, original_message_id, original_channel_id = row
+            await self.check_attachments(
+                reaction.message, original_channel_id, original_message_id
+            )
+        await reaction.message.delete()
+
+    async def check_attachments(
+        self,
+        alert_message: discord.Message,
+        channel_id: Optional[int],
+        message_id: Optional[int],
+    ) -> None:
+        """Delete the offending message recorded with the alert."""
+        if not channel_id or not message_id:
+            return
+        channel = alert_message.guild.get_channel(channel_id)
+        if channel is None:
+            return
+        try:
+            original = await channel.fetch_message(message_id)
+            await original.delete()
+        except discord.NotFound:
+            pass
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(NSFWChecker(client, client.db_handler))
+    logger.info("NSFWChecker cog loaded successfully.")
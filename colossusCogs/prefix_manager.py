@@ -0,0 +1,79 @@
+"""
+Prefix manager cog for ColossusBot.
+
+Lets staff pick a per-guild command prefix. Prefixes live in
+client.guild_prefixes, which the bot's command_prefix callable reads on
+every message; the DB copy exists so they survive restarts.
+"""
+
+import asyncio
+import logging
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+DEFAULT_PREFIX = "!"
+
+
+class PrefixManager(commands.Cog):
+    """Stores and serves per-guild command prefixes."""
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """Load every stored prefix into the in-memory map in one query."""
+        rows = await self.db_handler.fetchall(
+            "SELECT guild_id, prefix FROM guild_prefixes"
+        )
+        self.client.guild_prefixes.update(dict(rows))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded %d guild prefixes", len(rows))
+
+    async def set_guild_prefix_in_db(self, guild_id: int, prefix: str) -> None:
+        """Persist one guild's prefix."""
+        await self.db_handler.execute(
+            "INSERT INTO guild_prefixes (guild_id, prefix) VALUES (?, ?) "
+            "ON CONFLICT(guild_id) DO UPDATE SET prefix = excluded.prefix",
+            (guild_id, prefix),
+        )
+
+    @commands.command(name="setprefix")
+    @commands.has_permissions(manage_guild=True)
+    async def setprefix(self, ctx: commands.Context, prefix: str) -> None:
+        """Set this guild's command prefix."""
+        if len(prefix) > 5:
+            await ctx.send("Prefix must be five characters or fewer.")
+            return
+        # Re-setting the current prefix is a no-op: skip the DB write.
+        if self.client.guild_prefixes.get(ctx.guild.id) == prefix:
+            await ctx.send(f"The prefix is already `{prefix}`.")
+            return
+        self.client.guild_prefixes[ctx.guild.id] = prefix
+        # The in-memory map is authoritative for lookups, so the ack
+        # doesn't need to wait on the DB fsync.
+        asyncio.create_task(self.set_guild_prefix_in_db(ctx.guild.id, prefix))
+        await ctx.send(f"Prefix set to `{prefix}`.")
+
+    @commands.command(name="resetprefix")
+    @commands.has_permissions(manage_guild=True)
+    async def resetprefix(self, ctx: commands.Context) -> None:
+        """Restore this guild's prefix to the default."""
+        self.client.guild_prefixes.pop(ctx.guild.id, None)
+        asyncio.create_task(
+            self.db_handler.execute(
+                "DELETE FROM guild_prefixes WHERE guild_id = ?", (ctx.guild.id,)
+            )
+        )
+        await ctx.send(f"Prefix reset to `{DEFAULT_PREFIX}`.")
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(PrefixManager(client, client.db_handler))
+    logger.info("PrefixManager cog loaded successfully.")
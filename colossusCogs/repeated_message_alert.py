@@ -0,0 +1,431 @@
+"""
+Repeated message alert cog for ColossusBot.
+
+Detects identical messages posted by multiple users — the usual spam or
+raid signature — alerts staff, and lets moderators pick a follow-up
+action by reaction.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import pybloom_live
+except ImportError:  # pragma: no cover - optional dependency
+    pybloom_live = None
+
+import discord
+from cachetools import TTLCache
+from discord.ext import commands
+
+from colossusCogs.channel_archiver import snowflake_timestamp
+from handlers.database_handler import DatabaseHandler
+
+logger = logging.getLogger("ColossusBot")
+
+# Short messages ("ok", "lol") repeat constantly and are never spam.
+MIN_WORD_COUNT = 5
+# Distinct users that must have posted the content before staff are alerted.
+REPEAT_USER_THRESHOLD = 2
+# Contents whose distinct-character ratio falls below this are common
+# low-entropy chatter ("aaaa", emoji walls) - never worth an alert.
+MIN_DISTINCT_CHAR_RATIO = 0.25
+# The ratio's denominator is capped: natural text tops out around 70
+# distinct characters however long it runs, so dividing by the full
+# length would silently exempt exactly the long copypasta this cog
+# exists to catch.
+ENTROPY_LENGTH_CAP = 64
+# Discord rate-limits presence updates globally; never send more than
+# one per this many seconds.
+PRESENCE_DEBOUNCE = 30.0
+
+CONFIG_CACHE_TTL = 60.0
+
+# Module-level so the SQL text is byte-identical on every call and the
+# connection's prepared-statement cache always hits.
+_SELECT_OCCURRENCES = (
+    "SELECT user_id, message_id, channel_id, guild_id FROM repeated_messages "
+    "WHERE content_hash = ?"
+)
+
+ALERT_REACTIONS = ("✅", "❌")
+ACTION_REACTIONS = ("⚠️", "🔇", "👢", "🔨")
+VALID_REACTIONS = frozenset(ALERT_REACTIONS + ACTION_REACTIONS)
+
+
+def _has_min_words(content: str, minimum: int) -> bool:
+    """True once content holds at least `minimum` whitespace-separated words.
+
+    Stops scanning as soon as the count is reached instead of splitting
+    the whole string into a throwaway list.
+    """
+    count = 0
+    in_word = False
+    for ch in content:
+        if ch.isspace():
+            in_word = False
+        elif not in_word:
+            in_word = True
+            count += 1
+            if count >= minimum:
+                return True
+    return False
+
+
+_NORM_RE = re.compile(r"\s+")
+
+# Messages longer than this hash off-loop; shorter ones are cheaper to
+# fingerprint inline than to dispatch to an executor.
+_INLINE_HASH_LIMIT = 512
+
+
+def content_fingerprint(content: str) -> str:
+    """Fixed-width hash of normalized content used as the repeat-lookup key."""
+    normalized = _NORM_RE.sub(" ", content.strip().casefold())
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+
+class RepeatedMessageAlert(commands.Cog):
+    """Alerts staff when several users post the same message."""
+
+    def __init__(self, client: commands.Bot, db_handler: DatabaseHandler) -> None:
+        self.client = client
+        self.db_handler = db_handler
+        # Most messages are first occurrences; the filters answer
+        # "definitely not seen" without touching the DB. _seen_hashes
+        # tracks content, _seen_pairs tracks (user, content), and
+        # _cross_user_hashes holds content known to have come from at
+        # least two users - only those hashes are worth a DB probe.
+        # Falls back to plain sets when pybloom_live is not installed.
+        self._seen_hashes = self._make_filter()
+        self._seen_pairs = self._make_filter()
+        self._cross_user_hashes = self._make_filter()
+        self._last_presence_ts = 0.0
+        self._config_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        # Punishment reactions dispatch through a table, mirroring
+        # FlaggedWordsAlert's handler map.
+        # Tracking rows this process created, so reaction handling never
+        # races the batched writer; the DB remains the restart fallback.
+        self._alert_rows: Dict[int, int] = {}
+        self._action_rows: Dict[int, int] = {}
+        self._action_handlers = {
+            "⚠️": self._handle_warn,
+            "🔇": self._handle_mute,
+            "👢": self._handle_kick,
+            "🔨": self._handle_ban,
+        }
+        self._purge_task: Optional[asyncio.Task] = None
+        # Members resolved for reaction handling, so repeated moderator
+        # clicks don't rescan the guild member list (or hit the HTTP
+        # fallback) for the same user.
+        self._member_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+    @staticmethod
+    def _make_filter():
+        if pybloom_live is not None:
+            return pybloom_live.ScalableBloomFilter(
+                initial_capacity=10000, error_rate=0.001
+            )
+        return set()
+
+    async def cog_load(self) -> None:
+        self._purge_task = asyncio.create_task(self._purge_loop())
+
+    async def cog_unload(self) -> None:
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+
+    async def _purge_loop(self) -> None:
+        """Drop week-old occurrence rows so the hot index stays small.
+
+        Runs every five minutes so each delete touches a small batch of
+        rows instead of holding the write lock for an hour's backlog.
+        """
+        while True:
+            await asyncio.sleep(300)
+            try:
+                await self.db_handler.execute(
+                    "DELETE FROM repeated_messages "
+                    "WHERE timestamp < datetime('now', '-7 days')"
+                )
+                await self.db_handler.execute("PRAGMA optimize")
+            except Exception:
+                logger.exception("repeated_messages purge failed")
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """Rehydrate the seen-content filters so restarts don't miss repeats."""
+        rows, pair_rows = await asyncio.gather(
+            self.db_handler.fetchall(
+                "SELECT content_hash, COUNT(DISTINCT user_id) FROM repeated_messages "
+                "GROUP BY content_hash"
+            ),
+            self.db_handler.fetchall(
+                "SELECT DISTINCT user_id, content_hash FROM repeated_messages"
+            ),
+        )
+        for content_hash, user_count in rows:
+            self._seen_hashes.add(content_hash)
+            if user_count > 1:
+                self._cross_user_hashes.add(content_hash)
+        for user_id, content_hash in pair_rows:
+            self._seen_pairs.add(f"{user_id}:{content_hash}")
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        # author.bot is a plain attribute read that also covers our own
+        # messages; the old User.__eq__ against client.user paid an
+        # isinstance plus id comparison on every message just to filter
+        # one sender.
+        if message.author.bot or message.guild is None:
+            return
+        if not _has_min_words(message.content, MIN_WORD_COUNT):
+            return
+        if len(message.content) > _INLINE_HASH_LIMIT:
+            content_hash = await asyncio.get_running_loop().run_in_executor(
+                None, content_fingerprint, message.content
+            )
+        else:
+            content_hash = content_fingerprint(message.content)
+        pair = f"{message.author.id}:{content_hash}"
+        hash_seen = content_hash in self._seen_hashes
+        if hash_seen and pair not in self._seen_pairs:
+            # A different user posted this content before: promote it.
+            self._cross_user_hashes.add(content_hash)
+        self._seen_hashes.add(content_hash)
+        self._seen_pairs.add(pair)
+        # Fire-and-forget into the batched writer; dedup reads tolerate
+        # the sub-second flush lag.
+        self.db_handler.queue_insert(
+            "repeated_messages",
+            {
+                "guild_id": message.guild.id,
+                "user_id": message.author.id,
+                "channel_id": message.channel.id,
+                "message_id": message.id,
+                "content": message.content,
+                "content_hash": content_hash,
+            },
+        )
+        if content_hash not in self._cross_user_hashes:
+            # Never seen from two distinct users: the alert threshold
+            # cannot be met, so skip the DB probe entirely.
+            return
+        await self.check_for_repeated_messages(message, content_hash)
+
+    async def check_for_repeated_messages(
+        self, message: discord.Message, content_hash: str
+    ) -> None:
+        """Escalate when the content has been posted by several distinct users."""
+        # Low-entropy content matches enormous row counts and is never
+        # actionable spam; bail before the SQL round-trip.
+        content = message.content
+        if (
+            len(set(content)) / min(len(content), ENTROPY_LENGTH_CAP)
+            < MIN_DISTINCT_CHAR_RATIO
+        ):
+            return
+        # The cross-user filter already vetted this hash, so fetch the
+        # occurrence rows in one indexed query and derive the distinct
+        # user count in Python instead of paying a second round-trip.
+        occurrences = await self.db_handler.fetchall(
+            _SELECT_OCCURRENCES, (content_hash,)
+        )
+        # The current message may still sit in the write buffer, so count
+        # its author alongside the persisted rows.
+        if (
+            len({row[0] for row in occurrences} | {message.author.id})
+            < REPEAT_USER_THRESHOLD
+        ):
+            return
+        now = time.monotonic()
+        if now - self._last_presence_ts > PRESENCE_DEBOUNCE:
+            self._last_presence_ts = now
+            # Fire-and-forget: the alert fanout should not wait on a
+            # rate-limited gateway write.
+            asyncio.create_task(
+                self.client.change_presence(
+                    activity=discord.Game(name="Tracking repeated messages")
+                )
+            )
+        await self.send_alert(message, occurrences)
+
+    async def _resolve_member(
+        self, guild: discord.Guild, user_id: int
+    ) -> Optional[discord.Member]:
+        """Resolve a member via cache, then the gateway cache, then HTTP."""
+        key = (guild.id, user_id)
+        member = self._member_cache.get(key)
+        if member is not None:
+            return member
+        member = guild.get_member(user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(user_id)
+            except (discord.NotFound, discord.HTTPException):
+                return None
+        self._member_cache[key] = member
+        return member
+
+    async def get_config_cached(self, guild_id: int) -> Dict[str, Any]:
+        """Return the guild config, refreshing from the DB at most once per TTL."""
+        now = time.monotonic()
+        hit = self._config_cache.get(guild_id)
+        if hit is not None and now - hit[0] < CONFIG_CACHE_TTL:
+            return hit[1]
+        config = await self.db_handler.get_config(guild_id)
+        self._config_cache[guild_id] = (now, config)
+        return config
+
+    async def send_alert(
+        self, message: discord.Message, occurrences: List[Tuple[int, int, int, int]]
+    ) -> None:
+        """Post the staff alert embed listing every occurrence of the content."""
+        config = await self.get_config_cached(message.guild.id)
+        channel_id = config.get("staff_channel_id") or config.get("log_channel_id")
+        if not channel_id:
+            return
+        staff_channel = message.guild.get_channel(channel_id)
+        if staff_channel is None:
+            return
+        # Occurrence rows repeat the same guild/channel ids many times;
+        # resolve each distinct id once instead of per row.
+        guilds = {
+            gid: self.client.get_guild(gid)
+            for gid in {row[3] for row in occurrences}
+        }
+        channels = {}
+        # One line per user, built into a list and joined once; the
+        # timestamp tag is emitted from snowflake arithmetic directly so
+        # no datetime objects are allocated per row.
+        parts: List[str] = []
+        seen_users = set()
+        total_len = 0
+        for user_id, message_id, occ_channel_id, guild_id in occurrences:
+            if user_id in seen_users:
+                continue
+            guild = guilds[guild_id]
+            if guild is None:
+                continue
+            key = (guild_id, occ_channel_id)
+            if key not in channels:
+                channels[key] = guild.get_channel(occ_channel_id)
+            channel = channels[key]
+            if channel is None:
+                continue
+            line = (
+                f"<@{user_id}> - <t:{int(snowflake_timestamp(message_id))}:F> - "
+                f"{channel.mention}"
+            )
+            if total_len + len(line) + 1 > 1024:
+                break
+            seen_users.add(user_id)
+            parts.append(line)
+            total_len += len(line) + 1
+        embed = discord.Embed(
+            title="**Repeated Message Alert!**", color=discord.Color.gold()
+        )
+        embed.add_field(name="Message", value=message.content[:1024], inline=False)
+        embed.add_field(
+            name="Occurrences", value="\n".join(parts) or "-", inline=False
+        )
+        alert_message = await staff_channel.send(embed=embed)
+        await asyncio.gather(
+            *(alert_message.add_reaction(emoji) for emoji in ALERT_REACTIONS)
+        )
+        self._alert_rows[alert_message.id] = message.author.id
+        self.db_handler.queue_insert(
+            "repeated_alert_messages",
+            {
+                "alert_message_id": alert_message.id,
+                "guild_id": message.guild.id,
+                "user_id": message.author.id,
+            },
+        )
+
+    @commands.Cog.listener()
+    async def on_reaction_add(
+        self, reaction: discord.Reaction, user: discord.User
+    ) -> None:
+        if user.bot or reaction.message.guild is None:
+            return
+        if str(reaction.emoji) not in VALID_REACTIONS:
+            return
+        guild = reaction.message.guild
+        emoji = str(reaction.emoji)
+        flagged_user_id = self._alert_rows.get(reaction.message.id)
+        if flagged_user_id is None:
+            alert_row = await self.db_handler.fetch_repeated_alert_message(
+                reaction.message.id
+            )
+            if alert_row is not None:
+                flagged_user_id = alert_row[2]
+        if flagged_user_id is not None:
+            member = await self._resolve_member(guild, flagged_user_id)
+            if emoji == "✅":
+                await self.take_action(reaction.message, member)
+                self._alert_rows.pop(reaction.message.id, None)
+            elif emoji == "❌":
+                await reaction.message.delete()
+                self._alert_rows.pop(reaction.message.id, None)
+            return
+        action_user_id = self._action_rows.get(reaction.message.id)
+        if action_user_id is None:
+            action_row = await self.db_handler.fetch_repeated_action_message(
+                reaction.message.id
+            )
+            if action_row is None:
+                return
+            action_user_id = action_row[2]
+        member = await self._resolve_member(guild, action_user_id)
+        if member is None:
+            return
+        handler = self._action_handlers.get(emoji)
+        if handler is not None:
+            await handler(member, guild)
+            self._action_rows.pop(reaction.message.id, None)
+
+    async def _handle_warn(self, member: discord.Member, guild: discord.Guild) -> None:
+        admin = self.client.get_cog("AdminCommands")
+        if admin is not None:
+            await admin.log_warning(member.id, guild.id, "Repeated message spam")
+
+    async def _handle_mute(self, member: discord.Member, guild: discord.Guild) -> None:
+        mute_role = discord.utils.get(guild.roles, name="Muted")
+        if mute_role is not None:
+            await member.add_roles(mute_role, reason="Repeated message spam")
+
+    async def _handle_kick(self, member: discord.Member, guild: discord.Guild) -> None:
+        await member.kick(reason="Repeated message spam")
+
+    async def _handle_ban(self, member: discord.Member, guild: discord.Guild) -> None:
+        await member.ban(reason="Repeated message spam")
+
+    async def take_action(
+        self, alert_message: discord.Message, member: Optional[discord.Member]
+    ) -> None:
+        """Post the action prompt with one reaction per available punishment."""
+        action_message = await alert_message.channel.send(
+            f"Choose an action for {member.mention if member else 'the user'}:"
+        )
+        await asyncio.gather(
+            *(action_message.add_reaction(emoji) for emoji in ACTION_REACTIONS)
+        )
+        self._action_rows[action_message.id] = member.id if member else 0
+        self.db_handler.queue_insert(
+            "repeated_action_messages",
+            {
+                "action_message_id": action_message.id,
+                "guild_id": alert_message.guild.id,
+                "user_id": member.id if member else 0,
+            },
+        )
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(RepeatedMessageAlert(client, client.db_handler))
+    logger.info("RepeatedMessageAlert cog loaded successfully.")
@@ -0,0 +1,558 @@
+"""
+Database handler for ColossusBot.
+
+Wraps all SQLite access behind one class so cogs never touch SQL wiring
+directly. All queries share one long-lived WAL-mode aiosqlite
+connection so the page cache survives across calls; writes are
+serialized behind a lock because SQLite allows a single writer.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+logger = logging.getLogger("ColossusBot")
+
+
+class DatabaseHandler:
+    """Asynchronous SQLite access layer shared by every cog."""
+
+    _FLUSH_INTERVAL = 1.0
+    _FLUSH_MAX_ROWS = 100
+
+    def __init__(self, db_path: str = "colossusbot.db") -> None:
+        self.db_path = db_path
+        # (table, columns) -> pending value tuples for the batched writer.
+        self._pending_inserts: Dict[Tuple[str, Tuple[str, ...]], List[Tuple]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._conn_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    async def _get_conn(self) -> aiosqlite.Connection:
+        """Return the shared connection, opening and tuning it on first use."""
+        if self._conn is not None:
+            return self._conn
+        async with self._conn_lock:
+            if self._conn is None:
+                # sqlite3 keeps a per-connection LRU of prepared statements
+                # keyed by SQL text; a bigger cache means the hot queries
+                # never re-parse as long as their text is stable.
+                conn = await aiosqlite.connect(self.db_path, cached_statements=256)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA synchronous=NORMAL")
+                await conn.execute("PRAGMA cache_size=-65536")
+                await conn.execute("PRAGMA temp_store=MEMORY")
+                self._conn = conn
+        return self._conn
+
+    async def setup(self) -> None:
+        """Create any tables the bot expects on first run."""
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS autoresponses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                trigger TEXT NOT NULL,
+                response TEXT NOT NULL,
+                channel_id INTEGER
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS channel_perms_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                previous_state TEXT,
+                new_state TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS archived_channels (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel_id INTEGER NOT NULL,
+                original_category_id INTEGER,
+                archive_category_id INTEGER NOT NULL,
+                channel_type TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS archive_categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS security_incidents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                user_name TEXT,
+                details TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS flagged_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER,
+                message_id INTEGER,
+                content TEXT,
+                phrase TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS flagged_alert_messages (
+                alert_message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                original_message_id INTEGER,
+                original_channel_id INTEGER
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS nsfw_alert_messages (
+                alert_message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                original_message_id INTEGER,
+                original_channel_id INTEGER
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repeated_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER,
+                message_id INTEGER,
+                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        # The repeat probe filters on the fixed-width content hash and
+        # aggregates user_id; the composite index covers both without
+        # touching the table rows or comparing long text keys.
+        await self.execute(
+            "CREATE INDEX IF NOT EXISTS idx_repeated_hash_user "
+            "ON repeated_messages(content_hash, user_id)"
+        )
+        # The periodic purge deletes by age; keep that scan off the table.
+        await self.execute(
+            "CREATE INDEX IF NOT EXISTS idx_repeated_timestamp "
+            "ON repeated_messages(timestamp)"
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repeated_alert_messages (
+                alert_message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repeated_action_messages (
+                action_message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                hash TEXT PRIMARY KEY,
+                text TEXT,
+                is_nsfw INTEGER NOT NULL
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS guild_prefixes (
+                guild_id INTEGER PRIMARY KEY,
+                prefix TEXT NOT NULL
+            )
+            """
+        )
+        await self.execute(
+            """
+            CREATE TABLE IF NOT EXISTS config (
+                guild_id INTEGER PRIMARY KEY,
+                log_channel_id INTEGER,
+                staff_channel_id INTEGER,
+                staff_forum_channel_id INTEGER,
+                staff_thread_id INTEGER
+            )
+            """
+        )
+        logger.info("DatabaseHandler setup complete.")
+
+    async def execute(self, query: str, params: Tuple = ()) -> None:
+        """Run a single write statement and commit."""
+        db = await self._get_conn()
+        async with self._write_lock:
+            await db.execute(query, params)
+            await db.commit()
+
+    async def executemany(self, query: str, rows: List[Tuple]) -> None:
+        """Run one write statement for many parameter rows in a single transaction."""
+        db = await self._get_conn()
+        async with self._write_lock:
+            await db.executemany(query, rows)
+            await db.commit()
+
+    async def fetchone(self, query: str, params: Tuple = ()) -> Optional[Tuple]:
+        """Return the first row of a query, or None."""
+        db = await self._get_conn()
+        async with db.execute(query, params) as cursor:
+            return await cursor.fetchone()
+
+    async def fetchall(self, query: str, params: Tuple = ()) -> List[Tuple]:
+        """Return every row of a query."""
+        db = await self._get_conn()
+        async with db.execute(query, params) as cursor:
+            return await cursor.fetchall()
+
+    async def insert_record(self, table: str, record: Dict[str, Any]) -> None:
+        """Insert one row described as a column -> value mapping."""
+        columns = ", ".join(record)
+        placeholders = ", ".join("?" * len(record))
+        await self.execute(
+            f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+            tuple(record.values()),
+        )
+
+    def queue_insert(self, table: str, record: Dict[str, Any]) -> None:
+        """Buffer a row for the background batch writer (fire-and-forget).
+
+        Rows for the same table/column shape are flushed together with
+        executemany inside one transaction, amortizing the commit cost
+        across every insert queued since the last flush.
+        """
+        key = (table, tuple(record))
+        rows = self._pending_inserts.setdefault(key, [])
+        rows.append(tuple(record.values()))
+        # Bursts shouldn't buffer unbounded rows for a full interval:
+        # once any shape hits the cap, flush now instead of at the tick.
+        if len(rows) >= self._FLUSH_MAX_ROWS:
+            asyncio.create_task(self._flush_pending())
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_pending(self) -> None:
+        if not self._pending_inserts:
+            return
+        pending, self._pending_inserts = self._pending_inserts, {}
+        for (table, columns), rows in pending.items():
+            placeholders = ", ".join("?" * len(columns))
+            try:
+                await self.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                    rows,
+                )
+            except Exception:
+                logger.exception("Batched insert into %s failed", table)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._FLUSH_INTERVAL)
+            await self._flush_pending()
+
+    async def close(self) -> None:
+        """Stop the batch writer, flush anything queued, and close the connection."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._flush_pending()
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # Autoresponses
+    # ------------------------------------------------------------------
+
+    async def fetch_autoresponses(self, guild_id: int) -> List[Dict[str, Any]]:
+        """Return every autoresponse configured for a guild."""
+        rows = await self.fetchall(
+            "SELECT trigger, response, channel_id FROM autoresponses WHERE guild_id = ?",
+            (guild_id,),
+        )
+        # Triggers are matched case-insensitively; lower them once here so
+        # the per-message hot path never calls .lower() on a trigger.
+        return [
+            {"trigger": row[0].lower(), "response": row[1], "channel_id": row[2]}
+            for row in rows
+        ]
+
+    async def fetch_all_autoresponses(self) -> List[Dict[str, Any]]:
+        """Return every autoresponse across all guilds in one query."""
+        rows = await self.fetchall(
+            "SELECT guild_id, trigger, response, channel_id FROM autoresponses"
+        )
+        return [
+            {"guild_id": row[0], "trigger": row[1].lower(), "response": row[2], "channel_id": row[3]}
+            for row in rows
+        ]
+
+    async def add_autoresponse(
+        self, guild_id: int, trigger: str, response: str, channel_id: Optional[int] = None
+    ) -> None:
+        """Store a new autoresponse for a guild."""
+        await self.execute(
+            "INSERT INTO autoresponses (guild_id, trigger, response, channel_id) VALUES (?, ?, ?, ?)",
+            (guild_id, trigger, response, channel_id),
+        )
+
+    async def remove_autoresponse(self, guild_id: int, trigger: str) -> None:
+        """Delete an autoresponse by its trigger."""
+        await self.execute(
+            "DELETE FROM autoresponses WHERE guild_id = ? AND trigger = ?",
+            (guild_id, trigger),
+        )
+
+    # ------------------------------------------------------------------
+    # Channel archiver
+    # ------------------------------------------------------------------
+
+    async def add_archived_channel(
+        self,
+        channel_id: int,
+        original_category_id: Optional[int],
+        archive_category_id: int,
+        channel_type: str,
+    ) -> None:
+        """Record that a channel was moved into an archive category."""
+        await self.execute(
+            "INSERT INTO archived_channels (channel_id, original_category_id, "
+            "archive_category_id, channel_type) VALUES (?, ?, ?, ?)",
+            (channel_id, original_category_id, archive_category_id, channel_type),
+        )
+
+    async def insert_archived_channels_bulk(
+        self, rows: List[Tuple[int, Optional[int], int, str]]
+    ) -> None:
+        """Record many archived channels in one transaction."""
+        await self.executemany(
+            "INSERT INTO archived_channels (channel_id, original_category_id, "
+            "archive_category_id, channel_type) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    async def get_available_archive_category(self, guild_id: int) -> Optional[int]:
+        """Return the most recently created archive category for a guild."""
+        row = await self.fetchone(
+            "SELECT category_id FROM archive_categories WHERE guild_id = ? "
+            "ORDER BY id DESC LIMIT 1",
+            (guild_id,),
+        )
+        return row[0] if row else None
+
+    async def save_archive_category(self, guild_id: int, category_id: int) -> None:
+        """Remember a newly created archive category."""
+        await self.execute(
+            "INSERT INTO archive_categories (guild_id, category_id) VALUES (?, ?)",
+            (guild_id, category_id),
+        )
+
+    # ------------------------------------------------------------------
+    # Guild config
+    # ------------------------------------------------------------------
+
+    async def get_config(self, guild_id: int) -> Dict[str, Any]:
+        """Return the per-guild configuration row as a dict."""
+        row = await self.fetchone(
+            "SELECT log_channel_id, staff_channel_id, staff_forum_channel_id, staff_thread_id "
+            "FROM config WHERE guild_id = ?",
+            (guild_id,),
+        )
+        if row is None:
+            return {}
+        return {
+            "log_channel_id": row[0],
+            "staff_channel_id": row[1],
+            "staff_forum_channel_id": row[2],
+            "staff_thread_id": row[3],
+        }
+
+    async def get_log_channel_id(self, guild_id: int) -> Optional[int]:
+        """Return the configured log channel for a guild, if any."""
+        row = await self.fetchone(
+            "SELECT log_channel_id FROM config WHERE guild_id = ?", (guild_id,)
+        )
+        return row[0] if row else None
+
+    async def set_staff_channel_id(self, guild_id: int, channel_id: int) -> None:
+        """Set or replace the staff alert channel for a guild."""
+        await self.execute(
+            "INSERT INTO config (guild_id, staff_channel_id) VALUES (?, ?) "
+            "ON CONFLICT(guild_id) DO UPDATE SET staff_channel_id = excluded.staff_channel_id",
+            (guild_id, channel_id),
+        )
+
+    # ------------------------------------------------------------------
+    # Flagged words
+    # ------------------------------------------------------------------
+
+    async def insert_flagged_alert_message(
+        self,
+        alert_message_id: int,
+        guild_id: int,
+        user_id: int,
+        original_message_id: Optional[int] = None,
+        original_channel_id: Optional[int] = None,
+    ) -> None:
+        """Track a staff alert message so reactions on it can be resolved."""
+        await self.execute(
+            "INSERT OR REPLACE INTO flagged_alert_messages "
+            "(alert_message_id, guild_id, user_id, original_message_id, original_channel_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (alert_message_id, guild_id, user_id, original_message_id, original_channel_id),
+        )
+
+    async def fetch_flagged_alert_message(self, alert_message_id: int) -> Optional[Tuple]:
+        """Return the tracked alert row for a staff alert message, if any."""
+        return await self.fetchone(
+            "SELECT alert_message_id, guild_id, user_id, original_message_id, "
+            "original_channel_id FROM flagged_alert_messages WHERE alert_message_id = ?",
+            (alert_message_id,),
+        )
+
+    # ------------------------------------------------------------------
+    # Repeated messages
+    # ------------------------------------------------------------------
+
+    async def insert_repeated_message(
+        self,
+        guild_id: int,
+        user_id: int,
+        channel_id: int,
+        message_id: int,
+        content: str,
+        content_hash: str,
+    ) -> None:
+        """Record one message occurrence for repeat detection."""
+        await self.execute(
+            "INSERT INTO repeated_messages (guild_id, user_id, channel_id, "
+            "message_id, content, content_hash) VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, user_id, channel_id, message_id, content, content_hash),
+        )
+
+    async def insert_repeated_alert_message(
+        self, alert_message_id: int, guild_id: int, user_id: int
+    ) -> None:
+        """Track a repeated-message staff alert for reaction handling."""
+        await self.execute(
+            "INSERT OR REPLACE INTO repeated_alert_messages "
+            "(alert_message_id, guild_id, user_id) VALUES (?, ?, ?)",
+            (alert_message_id, guild_id, user_id),
+        )
+
+    async def fetch_repeated_alert_message(
+        self, alert_message_id: int
+    ) -> Optional[Tuple]:
+        """Return the tracked repeated-message alert row, if any."""
+        return await self.fetchone(
+            "SELECT alert_message_id, guild_id, user_id FROM repeated_alert_messages "
+            "WHERE alert_message_id = ?",
+            (alert_message_id,),
+        )
+
+    async def insert_repeated_action_message(
+        self, action_message_id: int, guild_id: int, user_id: int
+    ) -> None:
+        """Track a repeated-message action prompt for reaction handling."""
+        await self.execute(
+            "INSERT OR REPLACE INTO repeated_action_messages "
+            "(action_message_id, guild_id, user_id) VALUES (?, ?, ?)",
+            (action_message_id, guild_id, user_id),
+        )
+
+    async def fetch_repeated_action_message(
+        self, action_message_id: int
+    ) -> Optional[Tuple]:
+        """Return the tracked repeated-message action row, if any."""
+        return await self.fetchone(
+            "SELECT action_message_id, guild_id, user_id FROM repeated_action_messages "
+            "WHERE action_message_id = ?",
+            (action_message_id,),
+        )
+
+    # ------------------------------------------------------------------
+    # NSFW checker
+    # ------------------------------------------------------------------
+
+    async def insert_nsfw_alert_message(
+        self,
+        alert_message_id: int,
+        guild_id: int,
+        user_id: int,
+        original_message_id: Optional[int] = None,
+        original_channel_id: Optional[int] = None,
+    ) -> None:
+        """Track an NSFW staff alert so reactions on it can be resolved."""
+        await self.execute(
+            "INSERT OR REPLACE INTO nsfw_alert_messages "
+            "(alert_message_id, guild_id, user_id, original_message_id, "
+            "original_channel_id) VALUES (?, ?, ?, ?, ?)",
+            (alert_message_id, guild_id, user_id, original_message_id, original_channel_id),
+        )
+
+    async def get_ocr_cache(self, image_hash: str) -> Optional[Tuple[str, bool]]:
+        """Return (text, is_nsfw) for a previously analyzed image, if any."""
+        row = await self.fetchone(
+            "SELECT text, is_nsfw FROM ocr_cache WHERE hash = ?", (image_hash,)
+        )
+        return (row[0], bool(row[1])) if row else None
+
+    async def put_ocr_cache(self, image_hash: str, text: str, is_nsfw: bool) -> None:
+        """Persist an OCR verdict so repeat images skip analysis entirely."""
+        await self.execute(
+            "INSERT OR REPLACE INTO ocr_cache (hash, text, is_nsfw) VALUES (?, ?, ?)",
+            (image_hash, text, int(is_nsfw)),
+        )
+
+    async def fetch_nsfw_alert_message(self, alert_message_id: int) -> Optional[Tuple]:
+        """Return the tracked NSFW alert row for a staff message, if any."""
+        return await self.fetchone(
+            "SELECT alert_message_id, guild_id, user_id, original_message_id, "
+            "original_channel_id FROM nsfw_alert_messages WHERE alert_message_id = ?",
+            (alert_message_id,),
+        )
+
+    async def set_log_channel_id(self, guild_id: int, channel_id: int) -> None:
+        """Set or replace the log channel for a guild."""
+        await self.execute(
+            "INSERT INTO config (guild_id, log_channel_id) VALUES (?, ?) "
+            "ON CONFLICT(guild_id) DO UPDATE SET log_channel_id = excluded.log_channel_id",
+            (guild_id, channel_id),
+        )
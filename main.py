@@ -0,0 +1,62 @@
+"""
+ColossusBot entry point.
+
+Builds the bot, wires up the database handler, and loads every cog in
+colossusCogs/.
+"""
+
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+from pathlib import Path
+
+import discord
+from discord.ext import commands
+
+from handlers.database_handler import DatabaseHandler
+
+# Route all records through a queue so stream writes/flushes happen on
+# the listener thread instead of stalling the event loop.
+_log_queue: "queue.Queue" = queue.Queue(-1)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+_log_listener.start()
+logger = logging.getLogger("ColossusBot")
+
+COGS_DIR = Path(__file__).parent / "colossusCogs"
+
+
+def _command_prefix(client: commands.Bot, message: discord.Message) -> str:
+    if message.guild is None:
+        return "!"
+    return client.guild_prefixes.get(message.guild.id, "!")
+
+
+def build_client() -> commands.Bot:
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    client = commands.Bot(command_prefix=_command_prefix, intents=intents)
+    client.guild_prefixes = {}
+    client.db_handler = DatabaseHandler(os.getenv("COLOSSUS_DB_PATH", "colossusbot.db"))
+    return client
+
+
+async def main() -> None:
+    client = build_client()
+    await client.db_handler.setup()
+    for path in sorted(COGS_DIR.glob("*.py")):
+        if path.stem.startswith("_"):
+            continue
+        await client.load_extension(f"colossusCogs.{path.stem}")
+    await client.start(os.environ["BOT_TOKEN"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())